@@ -22,11 +22,14 @@ def generate() -> set[TypeCheckerAdapter]:
     }
 
 
-def get_adapter_classes() -> list[type[TypeCheckerAdapter]]:
-    return [
-        basedpyright_.BasedPyrightAdapter,
-        mypy_.MypyAdapter,
-        pyrefly_.PyreflyAdapter,
-        pyright_.PyrightAdapter,
-        ty_.TyAdapter,
-    ]
+_ADAPTER_CLASSES: tuple[type[TypeCheckerAdapter], ...] = (
+    basedpyright_.BasedPyrightAdapter,
+    mypy_.MypyAdapter,
+    pyrefly_.PyreflyAdapter,
+    pyright_.PyrightAdapter,
+    ty_.TyAdapter,
+)
+
+
+def get_adapter_classes() -> tuple[type[TypeCheckerAdapter], ...]:
+    return _ADAPTER_CLASSES
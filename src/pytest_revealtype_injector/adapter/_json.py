@@ -0,0 +1,19 @@
+from __future__ import annotations
+
+from typing import Any
+
+# Prefer orjson when installed, which is considerably faster than
+# json module on large type checker reports, and consumes bytes
+# directly without decoding first.
+try:
+    import orjson
+except ImportError:
+    import json
+
+    def loads(data: bytes | str) -> Any:
+        return json.loads(data)
+
+else:
+
+    def loads(data: bytes | str) -> Any:
+        return orjson.loads(data)
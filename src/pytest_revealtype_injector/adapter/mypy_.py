@@ -1,36 +1,41 @@
 from __future__ import annotations
 
+import argparse
 import ast
+import functools
 import importlib
-import json
+import importlib.util
+import os
 import pathlib
 import re
+import subprocess
 import sys
+import tempfile
 from collections.abc import (
-    Iterable,
+    Sequence,
 )
+from types import ModuleType
 from typing import (
+    Any,
     Literal,
     TypedDict,
     cast,
 )
 
-import mypy.api
+import pytest
 import schema as s
 
 from ..log import get_logger
 from ..models import (
+    TYPING_NAMES,
     FilePos,
     NameCollectorBase,
     TypeCheckerAdapter,
     TypeCheckerError,
     VarType,
+    forward_ref,
 )
-
-if sys.version_info >= (3, 14):
-    from annotationlib import ForwardRef
-else:
-    from typing import ForwardRef
+from . import _json
 
 _logger = get_logger()
 
@@ -45,68 +50,114 @@ class _MypyDiagObj(TypedDict):
     severity: Literal["note", "warning", "error"]
 
 
+# Referenced modules are almost always loaded already, skip
+# import machinery (and its locking) in that case.
+def _import_module(name: str) -> ModuleType:
+    if (mod := sys.modules.get(name)) is not None:
+        return mod
+    return importlib.import_module(name)
+
+
+# Components of attribute chain, like ("lxml", "etree", "_Element").
+# Returns None if chain is not rooted at a bare name.
+def _dotted(node: ast.expr) -> tuple[str, ...] | None:
+    parts: list[str] = []
+    while isinstance(node, ast.Attribute):
+        parts.append(node.attr)
+        node = node.value
+    if not isinstance(node, ast.Name):
+        return None
+    parts.append(node.id)
+    return tuple(reversed(parts))
+
+
 class NameCollector(NameCollectorBase):
     type_checker = "mypy"
 
+    def __init__(
+        self,
+        globalns: dict[str, Any],
+        localns: dict[str, Any],
+    ) -> None:
+        super().__init__(globalns, localns)
+        # Objects resolved for each prefix of attribute chains, so that
+        # common prefixes (like "builtins") are only resolved once
+        self._collected_by_path: dict[tuple[str, ...], Any] = {}
+
+    # Only the outmost node of an attribute chain is visited, as the
+    # whole dotted name is resolved here from top module downwards,
+    # instead of recursing into (and unparsing) every inner node.
     def visit_Attribute(self, node: ast.Attribute) -> ast.expr:
-        prefix = ast.unparse(node.value)
         name = node.attr
+        if (path := _dotted(node)) is None:
+            return self._use_bare_name(node)
+        prefix = ".".join(path[:-1])
 
-        setattr(node.value, "is_parent", True)
-        if not hasattr(node, "is_parent"):  # Outmost attribute node
+        try:
+            _ = _import_module(prefix)
+        except ModuleNotFoundError:
+            # Mypy resolve names according to external stub if
+            # available. For example, _ElementTree is determined
+            # as lxml.etree._element._ElementTree, which doesn't
+            # exist in runtime. Try to resolve bare names
+            # instead, which rely on runtime tests importing
+            # them properly before resolving.
             try:
-                _ = importlib.import_module(prefix)
-            except ModuleNotFoundError:
-                # Mypy resolve names according to external stub if
-                # available. For example, _ElementTree is determined
-                # as lxml.etree._element._ElementTree, which doesn't
-                # exist in runtime. Try to resolve bare names
-                # instead, which rely on runtime tests importing
-                # them properly before resolving.
-                try:
-                    eval(name, self._globalns, self._localns | self.collected)
-                except NameError as e:
-                    raise NameError(f'Cannot resolve "{prefix}" or "{name}"') from e
-                else:
-                    self.modified = True
-                    return ast.Name(id=name, ctx=node.ctx)
-
-        _ = self.visit(node.value)
-
-        if resolved := getattr(self.collected[prefix], name, False):
-            code = ast.unparse(node)
-            self.collected[code] = resolved
+                return self._use_bare_name(node)
+            except NameError as e:
+                raise NameError(f'Cannot resolve "{prefix}" or "{name}"') from e
+
+        if (resolved := self._resolve_path(path)) is not None:
             _logger.debug(
-                f"{self.type_checker} NameCollector resolved '{code}' as {resolved}"
+                f"{self.type_checker} NameCollector resolved "
+                f"'{'.'.join(path)}' as {resolved}"
             )
             return node
 
         # For class defined in local scope, mypy just prepends test
         # module name to class name. Of course concerned class does
         # not exist directly under test module. Use bare name here.
-        try:
-            eval(name, self._globalns, self._localns | self.collected)
-        except NameError:
-            raise
-        else:
-            self.modified = True
-            return ast.Name(id=name, ctx=node.ctx)
+        return self._use_bare_name(node)
+
+    def _resolve_path(self, path: tuple[str, ...]) -> Any:
+        by_path = self._collected_by_path
+        resolved = by_path.get(path[:1])
+        if resolved is None:
+            resolved = self._resolve_name(path[0])
+            by_path[path[:1]] = resolved
+        for i in range(2, len(path) + 1):
+            key = path[:i]
+            obj = by_path.get(key)
+            if obj is None:
+                obj = getattr(resolved, path[i - 1], None)
+                if obj is None:
+                    return None
+                by_path[key] = obj
+            resolved = obj
+        return resolved
+
+    def _use_bare_name(self, node: ast.Attribute) -> ast.Name:
+        name = node.attr
+        eval(name, self._globalns, self._ns)
+        self.modified = True
+        return ast.Name(id=name, ctx=node.ctx)
 
     # Mypy usually dumps full inferred type with module name,
     # but with a few exceptions (like tuple, Union).
-    # visit_Attribute can ultimately recurse into visit_Name
-    # as well
     def visit_Name(self, node: ast.Name) -> ast.Name:
-        name = node.id
+        _ = self._resolve_name(node.id)
+        return node
+
+    # Also resolves the top module of attribute chains
+    # for visit_Attribute
+    def _resolve_name(self, name: str) -> Any:
         try:
-            eval(name, self._globalns, self._localns | self.collected)
+            return eval(name, self._globalns, self._ns)
         except NameError:
             pass
-        else:
-            return node
 
         try:
-            mod = importlib.import_module(name)
+            mod = _import_module(name)
         except ModuleNotFoundError:
             pass
         else:
@@ -114,15 +165,14 @@ class NameCollector(NameCollectorBase):
             _logger.debug(
                 f"{self.type_checker} NameCollector resolved '{name}' as {mod}"
             )
-            return node
+            return mod
 
-        if hasattr(self.collected["typing"], name):
-            obj = getattr(self.collected["typing"], name)
+        if (obj := TYPING_NAMES.get(name)) is not None:
             self.collected[name] = obj
             _logger.debug(
                 f"{self.type_checker} NameCollector resolved '{name}' as {obj}"
             )
-            return node
+            return obj
 
         raise NameError(f'Cannot resolve "{name}"')
 
@@ -131,9 +181,11 @@ class NameCollector(NameCollectorBase):
     # Return only the left operand after processing.
     def visit_BinOp(self, node: ast.BinOp) -> ast.expr:
         if isinstance(node.op, ast.BitOr):  # union
-            node.left = self.visit(node.left)
-            node.right = self.visit(node.right)
-            return node
+            left = cast("ast.expr", self.visit(node.left))
+            right = cast("ast.expr", self.visit(node.right))
+            if left is node.left and right is node.right:
+                return node
+            return ast.BinOp(left=left, op=node.op, right=right)
         if isinstance(node.op, ast.MatMult) and isinstance(node.right, ast.Constant):
             return cast("ast.expr", self.visit(node.left))
         # For expression that haven't been accounted for, just don't
@@ -148,6 +200,7 @@ class NameCollector(NameCollectorBase):
 # literal string constants to not match), we iteratively
 # remove chars one by one only where parsing error occurs.
 #
+@functools.lru_cache(maxsize=1024)
 def _strip_unwanted_char(input: str) -> str:
     result = input
     while True:
@@ -160,10 +213,20 @@ def _strip_unwanted_char(input: str) -> str:
             return result
 
 
+# mypy only rejects negative worker count, while zero silently turns
+# parallel checking off; catch both before any checker runs
+def _positive_int(value: str) -> int:
+    result = int(value)
+    if result < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {result}")
+    return result
+
+
 class MypyAdapter(TypeCheckerAdapter):
     id = "mypy"
-    _executable = ""  # unused, calls mypy.api.run() here
-    _type_mesg_re = re.compile(r'Revealed type is "(?P<type>.+?)"')
+    _executable = ""  # unused, runs "python -m mypy" here
+    _type_mesg_re = re.compile(r'Revealed type is "(?P<type>.+)"')
+    _deleted_var_re = re.compile(r"<Deleted '(?P<var>.+)'>")
     _namecollector_class = NameCollector
     _schema = s.Schema({
         "file": str,
@@ -179,84 +242,132 @@ class MypyAdapter(TypeCheckerAdapter):
         ),
     })
 
-    def run_typechecker_on(self, paths: Iterable[pathlib.Path]) -> None:
-        mypy_args = [
-            "--output=json",
-        ]
+    def __init__(self) -> None:
+        super().__init__()
+        # Run through mypy daemon, which keeps analysis result across
+        # pytest sessions
+        self.use_daemon: bool = False
+        # Value of mypy --num-workers option, for parallel checking
+        self.num_workers: int | None = None
+
+    @classmethod
+    def longopt_for_daemon(cls) -> str:
+        return f"--revealtype-{cls.id}-daemon"
+
+    @classmethod
+    def longopt_for_workers(cls) -> str:
+        return f"--revealtype-{cls.id}-workers"
+
+    def run_typechecker_on(self, paths: Sequence[pathlib.Path]) -> None:
+        if importlib.util.find_spec("mypy") is None:
+            raise FileNotFoundError("mypy is required to run test suite")
+
+        cmd = [sys.executable, "-m"]
+        if self.use_daemon:
+            # Daemon is started on demand and left running for next
+            # session; it restarts by itself when options change
+            cmd.extend(["mypy.dmypy", "run", "--"])
+        else:
+            cmd.append("mypy")
+        cmd.append("--output=json")
+        if self.num_workers is not None:
+            # No need to pass --native-parser here, mypy turns it on
+            # whenever --num-workers is set (see process_options() in
+            # mypy/main.py, as of mypy 2.4)
+            cmd.append(f"--num-workers={self.num_workers}")
         if self.config_file is not None:
             if self.config_file == pathlib.Path():
                 cfg_str = ""  # see preprocess_config_file() below
             else:
                 cfg_str = str(self.config_file)
-            mypy_args.append(f"--config-file={cfg_str}")
-
-        mypy_args.extend(str(p) for p in paths)
-
-        _logger.debug(f"({self.id}) api.run(): {mypy_args}")
-        stdout, stderr, returncode = mypy.api.run(mypy_args)
+            cmd.append(f"--config-file={cfg_str}")
+
+        cmd.extend([str(p) for p in paths])
+
+        _logger.debug(f"({self.id}) Run command: {cmd}")
+        count = 0
+        error: _MypyDiagObj | None = None
+        match_type_mesg = self._type_mesg_re.fullmatch
+        # Diagnostics are parsed while mypy is still running, instead of
+        # buffering whole output first. stderr is sent to a temp file so
+        # that it can never fill up and block the stdout pipe.
+        with (
+            tempfile.TemporaryFile() as errfile,
+            subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=errfile) as proc,
+        ):
+            assert proc.stdout is not None
+            # So-called mypy json output is merely a line-by-line
+            # transformation of plain text output into json object
+            for line in proc.stdout:
+                if len(line) <= 2 or line[:1] != b"{":
+                    continue
+                count += 1
+                # Keep draining output after error, so that mypy
+                # can finish and deliver its return code
+                if error is not None:
+                    continue
+                if self.log_verbosity >= 2:
+                    _logger.debug(f"({self.id}) {line.decode().rstrip()}")
+                obj = _json.loads(line)
+                diag = cast(_MypyDiagObj, self._schema.validate(obj))
+                # HACK: Never trust return code from mypy. During early
+                # 1.11.x versions, mypy always return 1 for JSON output
+                # even when there's no error.
+                if diag["severity"] != "note":
+                    error = diag
+                    continue
+                if (m := match_type_mesg(diag["message"])) is None:
+                    continue
+                filename = os.path.basename(diag["file"])
+                pos = FilePos(filename, diag["line"])
+                expression = _strip_unwanted_char(m["type"])
+                try:
+                    # Unlike pyright, mypy output doesn't contain variable name
+                    self.typechecker_result[pos] = VarType(
+                        None, forward_ref(expression)
+                    )
+                except SyntaxError as e:
+                    if (m := self._deleted_var_re.fullmatch(expression)) is not None:
+                        raise TypeCheckerError(
+                            "{} does not support reusing deleted variable '{}'".format(
+                                self.id, m["var"]
+                            ),
+                            diag["file"],
+                            diag["line"],
+                        ) from e
+                    raise TypeCheckerError(
+                        f"Cannot parse type expression '{expression}'",
+                        diag["file"],
+                        diag["line"],
+                    ) from e
+            returncode = proc.wait()
+            _ = errfile.seek(0)
+            stderr = errfile.read().decode()
 
         # fatal error, before evaluation happens
         # mypy prints text output to stderr, not json
         if stderr:
             raise TypeCheckerError(stderr, None, None)
 
-        lines = stdout.splitlines()
+        if error is not None:
+            raise TypeCheckerError(
+                "{} {} with exit code {}: {}".format(
+                    self.id, error["severity"], returncode, error["message"]
+                ),
+                error["file"],
+                error["line"],
+                error["code"],
+            )
+
         _logger.info(
             "({}) Return code = {}, diagnostic count = {}.{}".format(
                 self.id,
                 returncode,
-                len(lines),
+                count,
                 " pytest -vv shows all items." if self.log_verbosity < 2 else "",
             )
         )
 
-        # So-called mypy json output is merely a line-by-line
-        # transformation of plain text output into json object
-        for line in lines:
-            if len(line) <= 2 or line[0] != "{":
-                continue
-            if self.log_verbosity >= 2:
-                _logger.debug(f"({self.id}) {line}")
-            obj = json.loads(line)
-            diag = cast(_MypyDiagObj, self._schema.validate(obj))
-            filename = pathlib.Path(diag["file"]).name
-            pos = FilePos(filename, diag["line"])
-            # HACK: Never trust return code from mypy. During early 1.11.x
-            # versions, mypy always return 1 for JSON output even when
-            # there's no error. Later on mypy command line has fixed this,
-            # but not mypy.api.run(), as of 1.13.
-            if diag["severity"] != "note":
-                raise TypeCheckerError(
-                    "{} {} with exit code {}: {}".format(
-                        self.id, diag["severity"], returncode, diag["message"]
-                    ),
-                    diag["file"],
-                    diag["line"],
-                    diag["code"],
-                )
-            if (m := self._type_mesg_re.fullmatch(diag["message"])) is None:
-                continue
-            expression = _strip_unwanted_char(m["type"])
-            try:
-                # Unlike pyright, mypy output doesn't contain variable name
-                self.typechecker_result[pos] = VarType(None, ForwardRef(expression))
-            except SyntaxError as e:
-                if (
-                    m := re.fullmatch(r"<Deleted '(?P<var>.+)'>", expression)
-                ) is not None:
-                    raise TypeCheckerError(
-                        "{} does not support reusing deleted variable '{}'".format(
-                            self.id, m["var"]
-                        ),
-                        diag["file"],
-                        diag["line"],
-                    ) from e
-                raise TypeCheckerError(
-                    f"Cannot parse type expression '{expression}'",
-                    diag["file"],
-                    diag["line"],
-                ) from e
-
     def preprocess_config_file(self, path_str: str) -> bool:
         if path_str:
             return False
@@ -268,6 +379,35 @@ class MypyAdapter(TypeCheckerAdapter):
         self._logger.info(f"({self.id}) Config file usage forbidden")
         return True
 
+    def set_extra_options(self, config: pytest.Config) -> None:
+        self.use_daemon = cast(bool, config.getoption(self.longopt_for_daemon()))
+        if self.use_daemon:
+            self._logger.info(f"({self.id}) Using mypy daemon")
+        self.num_workers = cast(
+            "int | None", config.getoption(self.longopt_for_workers())
+        )
+        if self.num_workers is not None:
+            self._logger.info(f"({self.id}) Using {self.num_workers} workers")
+
+    @classmethod
+    def add_pytest_option(cls, group: pytest.OptionGroup) -> None:
+        super().add_pytest_option(group)
+        group.addoption(
+            cls.longopt_for_daemon(),
+            action="store_true",
+            default=False,
+            help=f"Run {cls.id} through its daemon (dmypy), which stays alive "
+            "and reuses analysis result in later runs. Stop it with 'dmypy stop'",
+        )
+        group.addoption(
+            cls.longopt_for_workers(),
+            type=_positive_int,
+            default=None,
+            metavar="N",
+            help=f"Number of {cls.id} worker processes for parallel "
+            "checking, passed as --num-workers. Needs mypy version supporting it",
+        )
+
 
 def generate_adapter() -> TypeCheckerAdapter:
     return MypyAdapter()
@@ -2,12 +2,13 @@ from __future__ import annotations
 
 import ast
 import json
+import os
 import pathlib
 import re
 import shutil
 import subprocess
 import sys
-from collections.abc import Iterable
+from collections.abc import Sequence
 from typing import (
     Literal,
     TypedDict,
@@ -23,18 +24,15 @@ from ..models import (
     TypeCheckerAdapter,
     TypeCheckerError,
     VarType,
+    forward_ref,
 )
+from . import _json
 
 if sys.version_info >= (3, 11):
     from typing import TypedDict
 else:
     from typing_extensions import TypedDict
 
-if sys.version_info >= (3, 14):
-    from annotationlib import ForwardRef
-else:
-    from typing import ForwardRef
-
 _logger = get_logger()
 
 
@@ -81,7 +79,7 @@ class PyreflyAdapter(TypeCheckerAdapter):
         "severity": s.Or(s.Schema("error"), s.Schema("warn"), s.Schema("info")),
     })
 
-    def run_typechecker_on(self, paths: Iterable[pathlib.Path]) -> None:
+    def run_typechecker_on(self, paths: Sequence[pathlib.Path]) -> None:
         cmd: list[str] = []
         if shutil.which(self._executable) is not None:
             cmd.append(self._executable)
@@ -91,7 +89,7 @@ class PyreflyAdapter(TypeCheckerAdapter):
         cmd.extend(["check", "--output-format", "json"])
         if self.config_file is not None:
             cmd.extend(["-c", str(self.config_file)])
-        cmd.extend(str(p) for p in paths)
+        cmd.extend([str(p) for p in paths])
 
         _logger.debug(f"({self.id}) Run command: {cmd}")
         proc = subprocess.run(cmd, capture_output=True)
@@ -108,7 +106,7 @@ class PyreflyAdapter(TypeCheckerAdapter):
             )
 
         try:
-            report = json.loads(proc.stdout)
+            report = _json.loads(proc.stdout)
         except Exception as e:
             # pyrefly (circa 0.47.0) appends github text formatted annotation at the end of json output
             decoder = json.JSONDecoder()
@@ -128,6 +126,7 @@ class PyreflyAdapter(TypeCheckerAdapter):
             )
         )
 
+        match_type_mesg = self._type_mesg_re.fullmatch
         for item in items:
             diag = cast(_PyreflyDiagItem, self._schema.validate(item))
             if self.log_verbosity >= 2:
@@ -135,17 +134,17 @@ class PyreflyAdapter(TypeCheckerAdapter):
 
             if diag["name"] != "reveal-type":
                 continue
-            if (m := self._type_mesg_re.fullmatch(diag["description"])) is None:
+            if (m := match_type_mesg(diag["description"])) is None:
                 raise TypeCheckerError(
                     f"({self.id}) unexpected reveal-type message: {diag['description']}",
                     diag["path"],
                     diag["line"],
                 )
 
-            filename = pathlib.Path(diag["path"]).name
+            filename = os.path.basename(diag["path"])
             lineno = diag["line"]
             pos = FilePos(filename, lineno)
-            self.typechecker_result[pos] = VarType(None, ForwardRef(m["type"]))
+            self.typechecker_result[pos] = VarType(None, forward_ref(m["type"]))
 
 
 def generate_adapter() -> TypeCheckerAdapter:
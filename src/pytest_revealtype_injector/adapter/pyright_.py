@@ -1,13 +1,13 @@
 from __future__ import annotations
 
-import json
+import os
 import pathlib
 import re
 import shutil
 import subprocess
 import sys
 from collections.abc import (
-    Iterable,
+    Sequence,
 )
 from typing import (
     Literal,
@@ -23,18 +23,15 @@ from ..models import (
     TypeCheckerAdapter,
     TypeCheckerError,
     VarType,
+    forward_ref,
 )
+from . import _json
 
 if sys.version_info >= (3, 11):
     from typing import NotRequired, TypedDict
 else:
     from typing_extensions import NotRequired, TypedDict
 
-if sys.version_info >= (3, 14):
-    from annotationlib import ForwardRef
-else:
-    from typing import ForwardRef
-
 _logger = get_logger()
 
 
@@ -63,7 +60,7 @@ class NameCollector(BareNameCollector):
 class PyrightAdapter(TypeCheckerAdapter):
     id = "pyright"
     _executable = "pyright"
-    _type_mesg_re = re.compile('Type of "(?P<var>.+?)" is "(?P<type>.+?)"')
+    _type_mesg_re = re.compile('Type of "(?P<var>.+?)" is "(?P<type>.+)"')
     _namecollector_class = NameCollector
     # We only care about diagnostic messages that contain type information, that
     # is, items under "generalDiagnostics" key. Metadata not validated here.
@@ -82,7 +79,7 @@ class PyrightAdapter(TypeCheckerAdapter):
         s.Optional("rule"): str,
     })
 
-    def run_typechecker_on(self, paths: Iterable[pathlib.Path]) -> None:
+    def run_typechecker_on(self, paths: Sequence[pathlib.Path]) -> None:
         cmd: list[str] = []
         if shutil.which(self._executable) is not None:
             cmd.append(self._executable)
@@ -94,14 +91,14 @@ class PyrightAdapter(TypeCheckerAdapter):
         cmd.append("--outputjson")
         if self.config_file is not None:
             cmd.extend(["--project", str(self.config_file)])
-        cmd.extend(str(p) for p in paths)
+        cmd.extend([str(p) for p in paths])
 
         _logger.debug(f"({self.id}) Run command: {cmd}")
         proc = subprocess.run(cmd, capture_output=True)
         if len(proc.stderr):
             raise TypeCheckerError(proc.stderr.decode(), None, None)
 
-        report = json.loads(proc.stdout)
+        report = _json.loads(proc.stdout)
         _logger.info(
             "({}) Return code = {}, diagnostic count = {}.{}".format(
                 self.id,
@@ -111,6 +108,7 @@ class PyrightAdapter(TypeCheckerAdapter):
             )
         )
 
+        match_type_mesg = self._type_mesg_re.fullmatch
         for item in report["generalDiagnostics"]:
             diag = cast(_PyrightDiagItem, self._schema.validate(item))
             if self.log_verbosity >= 2:
@@ -120,7 +118,7 @@ class PyrightAdapter(TypeCheckerAdapter):
             # Pyright report lineno is 0-based, while
             # python frame lineno is 1-based
             lineno = diag["range"]["start"]["line"] + 1
-            filename = pathlib.Path(diag["file"]).name
+            filename = os.path.basename(diag["file"])
             if proc.returncode:
                 assert "rule" in diag
                 raise TypeCheckerError(
@@ -131,10 +129,10 @@ class PyrightAdapter(TypeCheckerAdapter):
                     lineno,
                     diag["rule"],
                 )
-            if (m := self._type_mesg_re.fullmatch(diag["message"])) is None:
+            if (m := match_type_mesg(diag["message"])) is None:
                 continue
             pos = FilePos(filename, lineno)
-            self.typechecker_result[pos] = VarType(m["var"], ForwardRef(m["type"]))
+            self.typechecker_result[pos] = VarType(m["var"], forward_ref(m["type"]))
 
 
 def generate_adapter() -> TypeCheckerAdapter:
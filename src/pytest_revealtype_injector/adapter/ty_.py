@@ -1,12 +1,12 @@
 from __future__ import annotations
 
-import json
+import os
 import pathlib
 import re
 import shutil
 import subprocess
 import sys
-from collections.abc import Iterable
+from collections.abc import Sequence
 from typing import cast
 
 import schema as s
@@ -18,18 +18,15 @@ from ..models import (
     TypeCheckerAdapter,
     TypeCheckerError,
     VarType,
+    forward_ref,
 )
+from . import _json
 
 if sys.version_info >= (3, 11):
     from typing import TypedDict
 else:
     from typing_extensions import TypedDict
 
-if sys.version_info >= (3, 14):
-    from annotationlib import ForwardRef
-else:
-    from typing import ForwardRef
-
 _logger = get_logger()
 
 
@@ -83,7 +80,7 @@ class TyAdapter(TypeCheckerAdapter):
         },
     })
 
-    def run_typechecker_on(self, paths: Iterable[pathlib.Path]) -> None:
+    def run_typechecker_on(self, paths: Sequence[pathlib.Path]) -> None:
         if shutil.which(self._executable) is None:
             raise FileNotFoundError(f"{self._executable} is required to run test suite")
 
@@ -94,7 +91,7 @@ class TyAdapter(TypeCheckerAdapter):
             "--output-format",
             "gitlab",
         ]
-        cmd.extend(str(p) for p in paths)
+        cmd.extend([str(p) for p in paths])
 
         if self.config_file is not None:
             cmd.extend(["--config-file", str(self.config_file)])
@@ -104,7 +101,7 @@ class TyAdapter(TypeCheckerAdapter):
         if proc.returncode == 101:  # internal error
             raise TypeCheckerError(proc.stderr.decode(), None, None)
 
-        report = json.loads(proc.stdout)
+        report = _json.loads(proc.stdout)
         _logger.info(
             "({}) Return code = {}, diagnostic count = {}.{}".format(
                 self.id,
@@ -114,6 +111,7 @@ class TyAdapter(TypeCheckerAdapter):
             )
         )
 
+        search_type_mesg = self._type_mesg_re.search
         for item in report:
             diag = cast(_TyDiagItem, self._schema.validate(item))
             if self.log_verbosity >= 2:
@@ -123,7 +121,7 @@ class TyAdapter(TypeCheckerAdapter):
             match proc.returncode:
                 case 1 | 2:
                     filename, lineno = (
-                        pathlib.Path(diag["location"]["path"]).name,
+                        os.path.basename(diag["location"]["path"]),
                         diag["location"]["positions"]["begin"]["line"],
                     )
                     raise TypeCheckerError(
@@ -150,13 +148,13 @@ class TyAdapter(TypeCheckerAdapter):
                     )
 
             filename, lineno = (
-                pathlib.Path(diag["location"]["path"]).name,
+                os.path.basename(diag["location"]["path"]),
                 diag["location"]["positions"]["begin"]["line"],
             )
-            if (m := self._type_mesg_re.search(diag["description"])) is None:
+            if (m := search_type_mesg(diag["description"])) is None:
                 continue
             pos = FilePos(filename, lineno)
-            self.typechecker_result[pos] = VarType(None, ForwardRef(m["type"]))
+            self.typechecker_result[pos] = VarType(None, forward_ref(m["type"]))
 
 
 def generate_adapter() -> TypeCheckerAdapter:
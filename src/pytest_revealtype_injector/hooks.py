@@ -1,7 +1,9 @@
 from __future__ import annotations
 
 import functools
-import inspect
+import operator
+import types
+import weakref
 from collections.abc import Iterator
 from concurrent import futures
 from typing import cast
@@ -13,7 +15,71 @@ from .main import revealtype_injector
 from .models import TypeCheckerAdapter
 
 _logger = log.get_logger()
-adapter_stash_key: pytest.StashKey[set[TypeCheckerAdapter]]
+adapter_stash_key: pytest.StashKey[tuple[TypeCheckerAdapter, ...]]
+
+# Modules providing the reveal_type() to be replaced
+_TYPING_MODULES = frozenset(("typing", "typing_extensions"))
+_get_path = operator.attrgetter("path")
+
+
+# Where reveal_type() is looked up by test module, as tuple of
+# (module to patch, attribute name, function name used in test code).
+# Module is None for the test module itself, so that cached values
+# never keep their own weak keys alive.
+_RevealTypeSite = tuple[types.ModuleType | None, str, str]
+
+# Module attributes hardly change between tests, so each test
+# module only needs to be scanned once. Entries go away together
+# with their modules, as long as values don't refer to the key.
+_reveal_type_sites: weakref.WeakKeyDictionary[
+    types.ModuleType, _RevealTypeSite | None
+] = weakref.WeakKeyDictionary()
+
+
+def _find_reveal_type_site(module: types.ModuleType) -> _RevealTypeSite | None:
+    # Exact type checks, without calls into inspect for every name;
+    # types looked up once instead of per name
+    function_type, module_type = types.FunctionType, types.ModuleType
+    mod_dict = module.__dict__
+
+    # Plain "from typing import reveal_type" is the usual case, which
+    # needs no scan. Aliased imports can only be found by value though.
+    item = mod_dict.get("reveal_type")
+    if (
+        type(item) is function_type
+        and item.__name__ == "reveal_type"
+        and item.__module__ in _TYPING_MODULES
+    ):
+        return (None, "reveal_type", "reveal_type")
+
+    # Only module globals matter, no need for sorted dir() and getattr().
+    # Namespace order is arbitrary, so imported function always wins over
+    # typing module, which is only used when no function is found.
+    module_site: _RevealTypeSite | None = None
+    for name, item in mod_dict.items():
+        if name[:2] == "__" or name[:3] == "@py":
+            continue
+
+        if type(item) is function_type:
+            if item.__name__ != "reveal_type" or item.__module__ not in _TYPING_MODULES:
+                continue
+            return (None, name, name)
+
+        elif type(item) is module_type and module_site is None:
+            # typing has no reveal_type() before Python 3.11
+            if item.__name__ not in _TYPING_MODULES or not hasattr(item, "reveal_type"):
+                continue
+            module_site = (item, "reveal_type", f"{name}.reveal_type")
+
+    return module_site
+
+
+def _get_reveal_type_site(module: types.ModuleType) -> _RevealTypeSite | None:
+    try:
+        return _reveal_type_sites[module]
+    except KeyError:
+        site = _reveal_type_sites[module] = _find_reveal_type_site(module)
+        return site
 
 
 @pytest.hookimpl(wrapper=True)
@@ -34,88 +100,105 @@ def pytest_pyfunc_call(pyfuncitem: pytest.Function) -> Iterator[None]:
         enabled_adapters = {a.id for a in adp_stash if a.id in only_mark.args}
         for a in enabled_adapters:
             _logger.info(
-                f"{a} adapter enabled by 'onlytypechecker' marker in {pyfuncitem.name} test"
+                "%s adapter enabled by 'onlytypechecker' marker in %s test",
+                a,
+                pyfuncitem.name,
             )
-        adapters = {a for a in adp_stash if a.id in enabled_adapters}
+        adapters = tuple(a for a in adp_stash if a.id in enabled_adapters)
 
     elif notype_mark:
         disabled_adapters = {a.id for a in adp_stash if a.id in notype_mark.args}
         for a in disabled_adapters:
             _logger.info(
-                f"{a} adapter disabled by 'notypechecker' marker in {pyfuncitem.name} test"
+                "%s adapter disabled by 'notypechecker' marker in %s test",
+                a,
+                pyfuncitem.name,
             )
-        adapters = {a for a in adp_stash if a.id not in disabled_adapters}
+        adapters = tuple(a for a in adp_stash if a.id not in disabled_adapters)
 
     else:
-        adapters = {a for a in adp_stash}
+        adapters = adp_stash
 
     if not adapters:
         pytest.skip("No type checker is enabled for this test.")
 
     # Monkeypatch reveal_type() with our own function, to guarantee
-    # each test func can receive different adapters
+    # each test func can receive different adapters. Nothing to patch
+    # for modules not using reveal_type().
     with pytest.MonkeyPatch.context() as mp:
-        for name in dir(pyfuncitem.module):
-            if name.startswith("__") or name.startswith("@py"):
-                continue
-
-            item = getattr(pyfuncitem.module, name)
-            if inspect.isfunction(item):
-                if item.__name__ != "reveal_type" or item.__module__ not in {
-                    "typing",
-                    "typing_extensions",
-                }:
-                    continue
-                injected = functools.partial(
-                    revealtype_injector,
-                    adapters=adapters,
-                    rt_funcname=name,
-                )
-                mp.setattr(pyfuncitem.module, name, injected)
+        if (site := _get_reveal_type_site(pyfuncitem.module)) is not None:
+            target, attr, rt_funcname = site
+            from_global = target is None
+            if target is None:
+                target = pyfuncitem.module
+            injected = functools.partial(
+                revealtype_injector,
+                adapters=adapters,
+                rt_funcname=rt_funcname,
+            )
+            mp.setattr(target, attr, injected)
+            # Logged for every test, so only format (including the costly
+            # repr of partial object) when INFO level is enabled
+            if from_global:
                 _logger.info(
-                    f"Replaced {name}() from global import with {injected} in {pyfuncitem.name} test"
-                )
-                break
-
-            elif inspect.ismodule(item):
-                if item.__name__ not in {"typing", "typing_extensions"}:
-                    continue
-                assert hasattr(item, "reveal_type")
-                injected = functools.partial(
-                    revealtype_injector,
-                    adapters=adapters,
-                    rt_funcname=f"{name}.reveal_type",
+                    "Replaced %s() from global import with %s in %s test",
+                    rt_funcname,
+                    injected,
+                    pyfuncitem.name,
                 )
-                mp.setattr(item, "reveal_type", injected)
+            else:
                 _logger.info(
-                    f"Replaced {name}.reveal_type() with {injected} in {pyfuncitem.name} test"
+                    "Replaced %s() with %s in %s test",
+                    rt_funcname,
+                    injected,
+                    pyfuncitem.name,
                 )
-                break
 
         return cast(None, (yield))  # type: ignore[redundant-cast]
 
 
 def pytest_collection_finish(session: pytest.Session) -> None:
-    files = {i.path for i in session.items}
-    if not files:
+    # Don't even start type checkers when nothing is collected,
+    # like when -k filter matches no test
+    adapters = session.config.stash[adapter_stash_key]
+    if not (session.items and adapters):
         return
-    # Stick with ThreadPoolExecutor
-    # mypy.api.run can't be executed as separate process
-    with futures.ThreadPoolExecutor() as executor:
+    # Item paths are absolute already, so that each file is checked once.
+    # Never resolve them, as checkers report the path as given, and
+    # a symlink target name would not match test frame file name.
+    files = tuple(sorted(set(map(_get_path, session.items))))
+    for adp in adapters:
+        adp.resolved_result.clear()
+    # All type checkers run as subprocesses, threads are
+    # sufficient for waiting on them concurrently. Give each
+    # checker its own thread so none waits for a free worker.
+    exc = None
+    with futures.ThreadPoolExecutor(max_workers=len(adapters)) as executor:
         fs = {
-            adp.id: executor.submit(adp.run_typechecker_on, files)
-            for adp in session.config.stash[adapter_stash_key]
+            executor.submit(adp.run_typechecker_on, files): adp.id for adp in adapters
         }
-    exc = None
-    length = max([len(k) for k in fs.keys()]) + 2
-    for adp_id in fs:
-        try:
-            _ = fs[adp_id].result()
-        except Exception as e:
-            print(f"{adp_id:{length}} FAIL")
-            exc = e
-        else:
-            print(f"{adp_id:{length}} OK")
+        # Locate reveal_type() in test modules while type checkers are
+        # running, so that test calls only need to apply the patch
+        for item in session.items:
+            if isinstance(item, pytest.Function) and item.module is not None:
+                try:
+                    _ = _get_reveal_type_site(item.module)
+                except Exception:
+                    # Leave it uncached, so that the error resurfaces
+                    # only in tests of that module, instead of aborting
+                    # the whole session
+                    continue
+        # Report each checker as soon as it finishes
+        length = max([len(k) for k in fs.values()]) + 2
+        for f in futures.as_completed(fs):
+            adp_id = fs[f]
+            try:
+                _ = f.result()
+            except Exception as e:
+                print(f"{adp_id:{length}} FAIL")
+                exc = e
+            else:
+                print(f"{adp_id:{length}} OK")
     if exc is not None:
         pytest.exit(
             f"({type(exc).__name__}) " + str(exc), pytest.ExitCode.INTERNAL_ERROR
@@ -144,21 +227,26 @@ def pytest_addoption(parser: pytest.Parser) -> None:
 def pytest_configure(config: pytest.Config) -> None:
     # Globally disable adapters using command line options
     global adapter_stash_key
-    adapter_stash_key = pytest.StashKey[set[TypeCheckerAdapter]]()
-    config.stash[adapter_stash_key] = set()
+    adapter_stash_key = pytest.StashKey[tuple[TypeCheckerAdapter, ...]]()
     verbosity = config.get_verbosity(config.VERBOSITY_TEST_CASES)
     log.set_verbosity(verbosity)
-    to_be_disabled = cast(list[str], config.getoption("revealtype_disable_adapter"))
-    all_ids: list[str] = []
-    for klass in adapter.get_adapter_classes():
-        all_ids.append(klass.id)
+    to_be_disabled = frozenset(
+        cast(list[str], config.getoption("revealtype_disable_adapter"))
+    )
+    classes = adapter.get_adapter_classes()
+    all_ids = [klass.id for klass in classes]
+    adapters: list[TypeCheckerAdapter] = []
+    for klass in classes:
         if klass.id in to_be_disabled:
             _logger.info(f"({klass.id}) adapter disabled with command line option")
             continue
         adp = klass()
         adp.set_config_file(config)
+        adp.set_extra_options(config)
         adp.log_verbosity = verbosity
-        config.stash[adapter_stash_key].add(adp)
+        adapters.append(adp)
+    # Fixed order, as adapters are iterated for every reveal_type() call
+    config.stash[adapter_stash_key] = tuple(adapters)
 
     # Marker to disable adapters on demand
     config.addinivalue_line(
@@ -1,7 +1,11 @@
 import ast
-import inspect
-import pathlib
+import functools
+import linecache
+import os
 import sys
+import types
+from collections import ChainMap
+from collections.abc import Sequence
 from typing import (
     Any,
     TypeVar,
@@ -48,19 +52,30 @@ class RevealTypeExtractor(ast.NodeVisitor):
             self.generic_visit(node)
 
 
-def _get_var_name(frame: inspect.Traceback, rt_funcname: str) -> str | None:
-    filename = pathlib.Path(frame.filename)
-    if not filename.exists():
+# Same type expressions tend to recur across many reveal_type() calls.
+# Collectors never modify the tree, so cached nodes can be reused.
+@functools.lru_cache(maxsize=1024)
+def _parse_forward_ref(expr: str) -> ast.Expression:
+    return ast.parse(expr, mode="eval")
+
+
+def _get_var_name(filename: str, lineno: int, rt_funcname: str) -> str | None:
+    # Test files may be rewritten within the same process (like
+    # pytester does), so make sure cached source is not stale
+    linecache.checkcache(filename)
+    # TODO is it possible to have multiline reveal_type()?
+    code = linecache.getline(filename, lineno).strip()
+    if not code:
         _logger.warning(
-            f"Stack frame points to file '{filename}' "
-            "which doesn't exist on local system."
+            f"Cannot read line {lineno} of file '{filename}', "
+            "which may not exist on local system."
         )
-    # TODO is it possible to have multiline reveal_type()?
-    ctxt, idx = frame.code_context, frame.index
-    assert ctxt is not None
-    assert idx is not None
-    code = ctxt[idx].strip()
+    return _extract_var_name(code, rt_funcname)
 
+
+# Same line gets evaluated many times in parametrized tests or loops
+@functools.lru_cache(maxsize=4096)
+def _extract_var_name(code: str, rt_funcname: str) -> str | None:
     walker = RevealTypeExtractor(rt_funcname)
     # 'exec' mode results in more complex AST but doesn't impose
     # as much restriction on test code as 'eval' mode does.
@@ -71,9 +86,29 @@ def _get_var_name(frame: inspect.Traceback, rt_funcname: str) -> str | None:
     return result
 
 
+def _resolve_type(
+    adp: TypeCheckerAdapter,
+    ref: ForwardRef,
+    globalns: dict[str, Any],
+    localns: dict[str, Any],
+) -> tuple[types.CodeType, dict[str, Any]]:
+    walker = adp.create_collector(globalns, localns)
+    old_ast = _parse_forward_ref(ref.__forward_arg__)
+    code = compile(old_ast, "<revealtype>", "eval")
+    try:
+        _ = eval(code, globalns, ChainMap(walker.collected, localns))
+    except (TypeError, NameError, AttributeError):
+        new_ast = walker.visit(old_ast)
+        if walker.modified:
+            # Compile the modified tree as is, no need to round-trip
+            # through source code. Only new nodes lack locations.
+            code = compile(ast.fix_missing_locations(new_ast), "<revealtype>", "eval")
+    return code, walker.collected
+
+
 def revealtype_injector(
     var: _T,
-    adapters: set[TypeCheckerAdapter],
+    adapters: Sequence[TypeCheckerAdapter],
     rt_funcname: str,
 ) -> _T:
     """Replacement of `reveal_type()` that matches static and runtime type
@@ -112,13 +147,18 @@ def revealtype_injector(
     # As a wrapper of typeguard.check_type_interal(),
     # get data from my caller, not mine
     caller_frame = sys._getframe(1)  # pyright: ignore[reportPrivateUsage]
-    caller = inspect.getframeinfo(caller_frame)
-    var_name = _get_var_name(caller, rt_funcname)
-    pos = FilePos(pathlib.Path(caller.filename).name, caller.lineno)
+    filename = caller_frame.f_code.co_filename
+    lineno = caller_frame.f_lineno
+    var_name = _get_var_name(filename, lineno, rt_funcname)
+    pos = FilePos(os.path.basename(filename), lineno)
 
     globalns = caller_frame.f_globals
     localns = caller_frame.f_locals
 
+    # Adapters usually agree on the type; skip a check which already passed
+    # with the same expression and the same collected names
+    checked: dict[types.CodeType, dict[str, Any]] = {}
+
     for adp in adapters:
         try:
             tc_result = adp.typechecker_result[pos]
@@ -137,16 +177,16 @@ def revealtype_injector(
         else:
             adp.typechecker_result[pos] = VarType(var_name, tc_result.type)
 
-        ref = tc_result.type
-        walker = adp.create_collector(globalns, localns)
         try:
-            evaluated = eval(ref.__forward_arg__, globalns, localns | walker.collected)
-        except (TypeError, NameError, AttributeError):
-            old_ast = ast.parse(ref.__forward_arg__, mode="eval")
-            new_ast = walker.visit(old_ast)
-            if walker.modified:
-                ref = ForwardRef(ast.unparse(new_ast))
-            evaluated = eval(ref.__forward_arg__, globalns, localns | walker.collected)
+            code, collected = adp.resolved_result[pos]
+        except KeyError:
+            code, collected = _resolve_type(adp, tc_result.type, globalns, localns)
+            adp.resolved_result[pos] = (code, collected)
+        if checked.get(code) == collected:
+            continue
+        # typeguard demands a real dict, merge only once for both uses
+        ns = localns | collected
+        evaluated = eval(code, globalns, ns)
 
         # HACK Mainly serves as a guard against mypy's behavior of blanket
         # inferring to Any when it can't determine the type under non-strict
@@ -160,13 +200,15 @@ def revealtype_injector(
                 pos.file,
                 pos.lineno,
             )
-        memo = TypeCheckMemo(globalns, localns | walker.collected)
+        memo = TypeCheckMemo(globalns, ns)
 
+        # Type is evaluated already, don't let typeguard do it again
         try:
-            check_type_internal(var, ref, memo)
+            check_type_internal(var, evaluated, memo)
         except TypeCheckError as e:
             # Only args[0] contains message
             e.args = (e.args[0] + f" (from {adp.id})",) + e.args[1:]
             raise
+        checked[code] = collected
 
     return var
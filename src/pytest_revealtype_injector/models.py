@@ -2,20 +2,27 @@ from __future__ import annotations
 
 import abc
 import ast
+import copy
+import functools
 import importlib
 import pathlib
 import re
 import sys
-from collections.abc import Iterable
+import types
+import typing
+from collections import ChainMap
+from collections.abc import Sequence
 from typing import (
     Any,
     ClassVar,
     NamedTuple,
+    TypeGuard,
     TypeVar,
     cast,
 )
 
 import pytest
+import typing_extensions
 from _pytest.config import Notset  # pyright: ignore[reportPrivateImportUsage]
 from schema import Schema
 
@@ -37,6 +44,13 @@ class VarType(NamedTuple):
     type: ForwardRef
 
 
+# ForwardRef() compiles its argument on construction (before 3.14);
+# type checkers report identical type strings for many call sites
+@functools.lru_cache(maxsize=4096)
+def forward_ref(expr: str) -> ForwardRef:
+    return ForwardRef(expr)
+
+
 class TypeCheckerError(Exception):
     # Can be None when type checker dies before any code evaluation
     def __init__(
@@ -63,7 +77,24 @@ class TypeCheckerError(Exception):
             return str(self.args[0])
 
 
-class NameCollectorBase(ast.NodeTransformer):
+# Flattened namespace of typing modules, so that bare names can be
+# resolved with a single lookup. typing takes precedence over
+# typing_extensions when both provide the same name.
+TYPING_NAMES: dict[str, Any] = {
+    k: v
+    for m in (typing_extensions, typing)
+    for k, v in vars(m).items()
+    if not k.startswith("__")
+}
+
+
+# Element type of list fields is unknown to type checkers, as with
+# any value from ast.iter_fields()
+def _is_field_list(value: object) -> TypeGuard[list[Any]]:
+    return isinstance(value, list)
+
+
+class NameCollectorBase(ast.NodeVisitor):
     type_checker: ClassVar[str]
     # typing_extensions guaranteed to be present,
     # as a dependency of typeguard
@@ -82,17 +113,63 @@ class NameCollectorBase(ast.NodeTransformer):
         self._localns = localns
         self.modified: bool = False
         self.collected = type(self).collected.copy()
+        # Names collected during walk shadow local ones, and are
+        # visible here as soon as they are added
+        self._ns = ChainMap(self.collected, localns)
+
+    # Parsed type expressions are cached and shared between
+    # collectors, so the tree must never be modified in place.
+    # Visitors return replacement nodes like ast.NodeTransformer,
+    # but changed nodes are copied instead. Most walks only resolve
+    # names, so nothing is allocated until a child actually changes.
+    def generic_visit(self, node: ast.AST) -> ast.AST:
+        changes: dict[str, Any] | None = None
+        for field, old_value in ast.iter_fields(node):
+            # None means no change
+            new_value: Any = None
+            if _is_field_list(old_value):
+                new_value = self._visit_list(old_value)
+            elif isinstance(old_value, ast.AST):
+                visited = self.visit(old_value)
+                if visited is not old_value:
+                    new_value = visited
+            if new_value is None:
+                continue
+            if changes is None:
+                changes = {}
+            changes[field] = new_value
+        if changes is None:
+            return node
+        new = copy.copy(node)
+        for field, value in changes.items():
+            setattr(new, field, value)
+        return new
+
+    # Returns copy of list only when any element is replaced
+    def _visit_list(self, old_values: list[Any]) -> list[Any] | None:
+        new_values: list[Any] | None = None
+        for i, v in enumerate(old_values):
+            if not isinstance(v, ast.AST):
+                continue
+            new_v = self.visit(v)
+            if new_v is not v:
+                if new_values is None:
+                    new_values = old_values.copy()
+                new_values[i] = new_v
+        return new_values
 
     def visit_Subscript(self, node: ast.Subscript) -> ast.expr:
-        node.value = cast("ast.expr", self.visit(node.value))
-        node.slice = cast("ast.expr", self.visit(node.slice))
+        value = cast("ast.expr", self.visit(node.value))
+        index = cast("ast.expr", self.visit(node.slice))
+        if value is not node.value or index is not node.slice:
+            node = ast.Subscript(value=value, slice=index, ctx=node.ctx)
 
         # When type reference is a stub-only specialized class
         # which don't have runtime support (e.g. lxml classes have
         # no __class_getitem__), concede by verifying
         # non-subscripted type.
         try:
-            eval(ast.unparse(node), self._globalns, self._localns | self.collected)
+            eval(ast.unparse(node), self._globalns, self._ns)
         except TypeError as e:
             if "is not subscriptable" not in e.args[0]:
                 raise
@@ -118,15 +195,11 @@ class BareNameCollector(NameCollectorBase):
     def visit_Name(self, node: ast.Name) -> ast.Name:
         name = node.id
         try:
-            eval(name, self._globalns, self._localns | self.collected)
+            eval(name, self._globalns, self._ns)
         except NameError:
-            for m in ("typing", "typing_extensions"):
-                if not hasattr(self.collected[m], name):
-                    continue
-                obj = getattr(self.collected[m], name)
-                self.collected[name] = obj
-                return node
-            raise
+            if (obj := TYPING_NAMES.get(name)) is None:
+                raise
+            self.collected[name] = obj
         return node
 
 
@@ -141,6 +214,9 @@ class TypeCheckerAdapter:
     def __init__(self) -> None:
         # {('file.py', 10): ('var_name', 'list[str]'), ...}
         self.typechecker_result: dict[FilePos, VarType] = {}
+        # Compiled type expression and names collected for evaluating it,
+        # memoized by revealtype_injector() for repeated calls
+        self.resolved_result: dict[FilePos, tuple[types.CodeType, dict[str, Any]]] = {}
         self._logger = get_logger()
         # logger level is already set by pytest_configure()
         # this only affects how much debug message is shown
@@ -153,7 +229,7 @@ class TypeCheckerAdapter:
         return f"--revealtype-{cls.id}-config"
 
     @abc.abstractmethod
-    def run_typechecker_on(self, paths: Iterable[pathlib.Path]) -> None: ...
+    def run_typechecker_on(self, paths: Sequence[pathlib.Path]) -> None: ...
 
     def create_collector(
         self, globalns: dict[str, Any], localns: dict[str, Any]
@@ -164,6 +240,10 @@ class TypeCheckerAdapter:
         """Optional preprocessing of configuration file"""
         return False
 
+    def set_extra_options(self, config: pytest.Config) -> None:
+        """Optional handling of adapter specific command line options"""
+        return
+
     def set_config_file(self, config: pytest.Config) -> None:
         path_str = config.getoption(self.longopt_for_config())
         # pytest addoption() should have set default value
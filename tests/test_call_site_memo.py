@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+import pytest
+
+
+# Resolved types are memoized per reveal_type() call site, yet each
+# call must still be checked against its own runtime value
+class TestCallSiteMemo:
+    def test_repeated_call(self, pytester: pytest.Pytester) -> None:
+        pytester.makeconftest("pytest_plugins = ['pytest_revealtype_injector.plugin']")
+        pytester.makepyprojecttoml(
+            """
+            [tool.basedpyright]
+            reportUnreachable = false
+            """
+        )
+        pytester.makepyfile(  # pyright: ignore[reportUnknownMemberType]
+            """
+            import sys
+            from typing import cast
+
+            import pytest
+
+            if sys.version_info >= (3, 11):
+                from typing import reveal_type
+            else:
+                from typing_extensions import reveal_type
+
+            @pytest.mark.parametrize("val", ["foo", "bar", 1])
+            def test_param(val: object) -> None:
+                x = cast(str, val)
+                assert reveal_type(x) is val
+            """
+        )
+        result = pytester.runpytest("--tb=short", "-v")
+        result.assert_outcomes(passed=2, failed=1)
@@ -101,3 +101,36 @@ class TestImport:
         )
         result = pytester.runpytest("--tb=short", "-v")
         result.assert_outcomes(passed=2)
+
+    # Function import must win over typing module import, no matter
+    # which one comes first in module namespace
+    def test_import_as_after_module(self, pytester: pytest.Pytester) -> None:
+        pytester.makeconftest("pytest_plugins = ['pytest_revealtype_injector.plugin']")
+        pytester.makepyprojecttoml(
+            """
+            [tool.basedpyright]
+            reportUnreachable = false
+            reportUnusedCallResult = false
+            """
+        )
+        pytester.makepyfile(  # pyright: ignore[reportUnknownMemberType]
+            """
+            import sys
+            import typing
+            import pytest
+            from typeguard import TypeCheckError
+
+            if sys.version_info >= (3, 11):
+                from typing import reveal_type as rt
+            else:
+                from typing_extensions import reveal_type as rt
+
+            @pytest.mark.parametrize("val", [1])
+            def test_bad_cast(val: object) -> None:
+                x = typing.cast(str, val)
+                with pytest.raises(TypeCheckError, match='is not an instance of str'):
+                    rt(x)
+            """
+        )
+        result = pytester.runpytest("--tb=short", "-v")
+        result.assert_outcomes(passed=1)
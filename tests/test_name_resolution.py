@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import pytest
+
+
+class TestNameResolution:
+    def test_qualified_name(self, pytester: pytest.Pytester) -> None:
+        pytester.makeconftest("pytest_plugins = ['pytest_revealtype_injector.plugin']")
+        pytester.makepyprojecttoml(
+            """
+            [tool.basedpyright]
+            reportUnreachable = false
+            """
+        )
+        pytester.makepyfile(  # pyright: ignore[reportUnknownMemberType]
+            """
+            import collections
+            import sys
+            from xml.etree.ElementTree import Element
+
+            if sys.version_info >= (3, 11):
+                from typing import reveal_type
+            else:
+                from typing_extensions import reveal_type
+
+            def test_nested_module() -> None:
+                x = Element("foo")
+                reveal_type(x)
+
+            def test_subscript() -> None:
+                x: collections.OrderedDict[str, int] = collections.OrderedDict()
+                reveal_type(x)
+            """
+        )
+        result = pytester.runpytest("--tb=short", "-v")
+        result.assert_outcomes(passed=2)
+
+    def test_local_class(self, pytester: pytest.Pytester) -> None:
+        pytester.makeconftest("pytest_plugins = ['pytest_revealtype_injector.plugin']")
+        pytester.makepyprojecttoml(
+            """
+            [tool.basedpyright]
+            reportUnreachable = false
+            """
+        )
+        pytester.makepyfile(  # pyright: ignore[reportUnknownMemberType]
+            """
+            import sys
+
+            if sys.version_info >= (3, 11):
+                from typing import reveal_type
+            else:
+                from typing_extensions import reveal_type
+
+            def test_local() -> None:
+                class Foo:
+                    pass
+
+                x = [Foo()]
+                reveal_type(x)
+            """
+        )
+        result = pytester.runpytest("--tb=short", "-v")
+        result.assert_outcomes(passed=1)
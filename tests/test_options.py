@@ -1,6 +1,8 @@
 from __future__ import annotations
 
 import inspect
+import subprocess
+import sys
 
 import pytest
 
@@ -93,3 +95,134 @@ class TestDisableTypeChecker:
         result = pytester.runpytest(*opts)
         assert result.ret == pytest.ExitCode.OK
         result.assert_outcomes(passed=1, failed=0)
+
+    def test_disable_all(self, pytester: pytest.Pytester) -> None:
+        pytester.makeconftest("pytest_plugins = ['pytest_revealtype_injector.plugin']")
+        pytester.makepyfile(  # pyright: ignore[reportUnknownMemberType]
+            self.content_fail
+        )
+        opts = self._gen_pytest_opts([
+            "basedpyright",
+            "mypy",
+            "pyright",
+            "pyrefly",
+            "ty",
+        ])
+        result = pytester.runpytest(*opts)
+        assert result.ret == pytest.ExitCode.OK
+        result.assert_outcomes(skipped=1)
+
+    def test_deselect_all(self, pytester: pytest.Pytester) -> None:
+        pytester.makeconftest("pytest_plugins = ['pytest_revealtype_injector.plugin']")
+        pytester.makepyfile(  # pyright: ignore[reportUnknownMemberType]
+            self.content_fail
+        )
+        result = pytester.runpytest("-k", "no_such_test", "-vv")
+        assert result.ret == pytest.ExitCode.NO_TESTS_COLLECTED
+        # Type checkers never run, thus never report
+        result.stdout.no_fnmatch_line("mypy* OK")
+        result.stdout.no_fnmatch_line("mypy* FAIL")
+
+
+class TestMypyOptions:
+    content = inspect.cleandoc(
+        """
+        import sys
+
+        if sys.version_info >= (3, 11):
+            from typing import reveal_type
+        else:
+            from typing_extensions import reveal_type
+
+        def test_list() -> None:
+            x = [1, 2]
+            reveal_type(x)
+        """
+    )
+
+    def _setup(self, pytester: pytest.Pytester) -> list[str]:
+        pytester.makeconftest("pytest_plugins = ['pytest_revealtype_injector.plugin']")
+        pytester.makepyprojecttoml(
+            """
+            [tool.mypy]
+            strict = true
+            """
+        )
+        pytester.makepyfile(  # pyright: ignore[reportUnknownMemberType]
+            self.content
+        )
+        return [
+            f"--revealtype-disable-adapter={a}"
+            for a in ("basedpyright", "pyright", "pyrefly", "ty")
+        ]
+
+    def test_daemon(self, pytester: pytest.Pytester) -> None:
+        opts = self._setup(pytester)
+        opts.extend(["--revealtype-mypy-daemon", "--tb=short", "-vv"])
+        try:
+            # Second run is served by the daemon started in first run
+            for _ in range(2):
+                result = pytester.runpytest(*opts)
+                assert result.ret == pytest.ExitCode.OK
+                result.assert_outcomes(passed=1, failed=0)
+        finally:
+            _ = subprocess.run(
+                [sys.executable, "-m", "mypy.dmypy", "stop"],
+                cwd=pytester.path,
+                capture_output=True,
+            )
+
+    # Exit status depends on whether installed mypy supports parallel
+    # checking, so only check the command line it was given
+    def test_workers_forwarded(self, pytester: pytest.Pytester) -> None:
+        opts = self._setup(pytester)
+        opts.extend([
+            "--revealtype-mypy-workers=2",
+            "--log-cli-level=DEBUG",
+            "--tb=short",
+            "-vv",
+        ])
+        result = pytester.runpytest(*opts)
+        result.stdout.fnmatch_lines(["*(mypy) Run command: *'--num-workers=2'*"])
+
+    @pytest.mark.parametrize("count", ["0", "-1"])
+    def test_workers_invalid(self, pytester: pytest.Pytester, count: str) -> None:
+        opts = self._setup(pytester)
+        opts.append(f"--revealtype-mypy-workers={count}")
+        result = pytester.runpytest(*opts)
+        assert result.ret == pytest.ExitCode.USAGE_ERROR
+        result.stderr.fnmatch_lines(["*must be at least 1*"])
+
+
+class TestSymlink:
+    content = inspect.cleandoc(
+        """
+        import sys
+
+        if sys.version_info >= (3, 11):
+            from typing import reveal_type
+        else:
+            from typing_extensions import reveal_type
+
+        def test_list() -> None:
+            x = [1, 2]
+            reveal_type(x)
+        """
+    )
+
+    # Type checkers must be given the path as collected, as test
+    # frames report symlink name instead of target file name
+    def test_symlinked_file(self, pytester: pytest.Pytester) -> None:
+        pytester.makeconftest("pytest_plugins = ['pytest_revealtype_injector.plugin']")
+        pytester.makepyprojecttoml(
+            """
+            [tool.basedpyright]
+            reportUnreachable = false
+            """
+        )
+        real_dir = pytester.mkdir("real")
+        _ = (real_dir / "impl_file.py").write_text(self.content)
+        (pytester.path / "test_link.py").symlink_to(real_dir / "impl_file.py")
+        result = pytester.runpytest("test_link.py", "--tb=short", "-vv")
+        assert result.ret == pytest.ExitCode.OK
+        result.assert_outcomes(passed=1)